@@ -1,10 +1,108 @@
 import streamlit as st
 import yfinance as yf
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from dataclasses import asdict, fields
 from datetime import datetime, timedelta
-import base64
-from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+import requests
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from stock_info import StockInfo
+
+# Options for the sidebar selectors
+PERIOD_OPTIONS = ("1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y", "ytd", "max")
+INTERVAL_OPTIONS = ("1d", "5d", "1wk", "1mo", "3mo")
+CHART_TYPES = ("Candlestick", "Line (WebGL)")
+
+# Popular stocks shown on the landing page
+POPULAR_STOCKS = {
+    "AAPL": "Apple Inc.",
+    "MSFT": "Microsoft Corporation",
+    "GOOGL": "Alphabet Inc.",
+    "AMZN": "Amazon.com, Inc.",
+    "TSLA": "Tesla, Inc.",
+    "META": "Meta Platforms, Inc.",
+    "NVDA": "NVIDIA Corporation",
+    "JPM": "JPMorgan Chase & Co.",
+    "V": "Visa Inc.",
+    "WMT": "Walmart Inc."
+}
+POPULAR_SYMBOLS = tuple(POPULAR_STOCKS)
+
+# Key financial metrics shown in the metrics table
+METRIC_KEYS = (
+    'previousClose', 'open', 'dayLow', 'dayHigh', 'volume', 'averageVolume',
+    'fiftyDayAverage', 'twoHundredDayAverage', 'marketCap', 'beta',
+    'trailingPE', 'forwardPE', 'dividendYield', 'trailingAnnualDividendYield',
+    'earningsQuarterlyGrowth', 'priceToSalesTrailing12Months'
+)
+
+# Readable names for the key financial metrics
+METRIC_NAMES = {
+    'previousClose': 'Previous Close',
+    'open': 'Open',
+    'dayLow': 'Day Low',
+    'dayHigh': 'Day High',
+    'volume': 'Volume',
+    'averageVolume': 'Average Volume',
+    'fiftyDayAverage': '50-Day Average',
+    'twoHundredDayAverage': '200-Day Average',
+    'marketCap': 'Market Cap',
+    'beta': 'Beta',
+    'trailingPE': 'Trailing P/E',
+    'forwardPE': 'Forward P/E',
+    'dividendYield': 'Dividend Yield',
+    'trailingAnnualDividendYield': 'Trailing Annual Dividend Yield',
+    'earningsQuarterlyGrowth': 'Earnings Quarterly Growth',
+    'priceToSalesTrailing12Months': 'Price to Sales (TTM)'
+}
+
+# Display formats for metrics that are not shown as plain numbers
+METRIC_FORMATS = {
+    'volume': "{:,.0f}",
+    'averageVolume': "{:,.0f}",
+    'marketCap': "{:,.0f}",
+    'dividendYield': "{:.2%}",
+    'trailingAnnualDividendYield': "{:.2%}"
+}
+DEFAULT_METRIC_FORMAT = "{:.2f}"
+
+# Maximum number of candles sent to the browser for one chart
+CHART_MAX_CANDLES = 1000
+
+# Shared chart layout with a secondary y-axis for volume, only the title varies per stock
+CHART_LAYOUT = dict(
+    xaxis_title="Date",
+    yaxis_title="Price ($)",
+    yaxis2=dict(
+        title="Volume",
+        overlaying="y",
+        side="right",
+        showgrid=False
+    ),
+    height=600,
+    hovermode="x unified",
+    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+)
+
+# Largest price float32 still resolves to the cent (2**17, above which its step exceeds 0.01)
+FLOAT32_MAX_PRICE = 131_072
+
+# Maximum number of rows sent to the browser for the historical data table
+HISTORY_TABLE_ROWS = 500
+
+# File extension and MIME type for each download format
+DOWNLOAD_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/octet-stream"),
+    "Feather": ("feather", "application/octet-stream")
+}
 
 # Set page configuration
 st.set_page_config(
@@ -37,21 +135,53 @@ with st.sidebar:
     end_date = st.date_input("End Date", value=today)
     
     # Period selection
-    period_options = ["1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y", "ytd", "max"]
-    period = st.selectbox("Or select a time period", period_options, index=5)
+    period = st.selectbox("Or select a time period", PERIOD_OPTIONS, index=5)
     
     # Interval selection
-    interval_options = ["1d", "5d", "1wk", "1mo", "3mo"]
-    interval = st.selectbox("Select interval", interval_options, index=0)
+    interval = st.selectbox("Select interval", INTERVAL_OPTIONS, index=0)
+    
+    # Chart type selection
+    chart_type = st.selectbox("Chart type", CHART_TYPES, index=0)
+
+# Shared HTTP session that caches Yahoo Finance responses on disk across reruns and restarts
+@st.cache_resource
+def get_http_session():
+    http_session = CachedSession('.yf_cache', expire_after=3600, backend='sqlite')
+    # Keep enough pooled keep-alive connections for the parallel fetches and retry dropped connections
+    http_session.mount('https://', HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=3))
+    return http_session
+
+# Uncached HTTP session for the header quotes, whose freshness is governed by their own 1-minute cache
+@st.cache_resource
+def get_quote_session():
+    http_session = requests.Session()
+    http_session.mount('https://', HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=3))
+    return http_session
+
+session = get_http_session()
+quote_session = get_quote_session()
+
+# Function to shrink OHLCV columns to the smallest dtypes the chart needs
+def downcast_ohlcv(data):
+    price_columns = [column for column in ('Open', 'High', 'Low', 'Close') if column in data]
+    # float32 only keeps cents below FLOAT32_MAX_PRICE, so higher-priced histories stay float64
+    if data[price_columns].abs().max().max() < FLOAT32_MAX_PRICE:
+        data = data.astype({column: 'float32' for column in price_columns})
+    else:
+        data = data.copy()
+    # Only downcasts when every volume fits an integer type, so NaN rows are left as float
+    data['Volume'] = pd.to_numeric(data['Volume'], downcast='integer')
+    return data
 
 # Function to get stock data
 @st.cache_data(ttl=3600)  # Cache data for 1 hour
 def get_stock_data(ticker, start=None, end=None, period=None, interval="1d"):
     try:
+        # auto_adjust=True keeps the split- and dividend-adjusted OHLC prices yfinance returns by default
         if period and period != "custom":
-            data = yf.download(ticker, period=period, interval=interval)
+            data = yf.download(ticker, period=period, interval=interval, threads=True, progress=False, auto_adjust=True, multi_level_index=False, session=session)
         else:
-            data = yf.download(ticker, start=start, end=end, interval=interval)
+            data = yf.download(ticker, start=start, end=end, interval=interval, threads=True, progress=False, auto_adjust=True, multi_level_index=False, session=session)
         
         if data.empty:
             return None
@@ -64,41 +194,241 @@ def get_stock_data(ticker, start=None, end=None, period=None, interval="1d"):
 @st.cache_data(ttl=3600)  # Cache data for 1 hour
 def get_stock_info(ticker):
     try:
-        ticker_obj = yf.Ticker(ticker)
+        ticker_obj = yf.Ticker(ticker, session=session)
         info = ticker_obj.info
-        return info
+        # Keep only the displayed fields so the cached value stays small
+        return StockInfo(**{field.name: info.get(field.name) for field in fields(StockInfo)})
     except Exception as e:
         st.error(f"Error fetching stock info: {e}")
         return None
 
-# Function to create a download link for dataframe
-def get_csv_download_link(df, filename="stock_data.csv"):
-    csv = df.to_csv(index=True)
-    b64 = base64.b64encode(csv.encode()).decode()
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">Download CSV File</a>'
-    return href
+# Function to get the company profile text shown in the About the Company section
+@st.cache_data(ttl=3600)  # Cache data for 1 hour
+def get_business_summary(ticker):
+    info = get_stock_info(ticker)
+    if info is None:
+        return ''
+    return info.longBusinessSummary or ''
 
-# Main content area
+# Function to get the lightweight quote fields used by the header cards
+@st.cache_data(ttl=60)  # Cache data for 1 minute
+def get_stock_fast_info(ticker):
+    try:
+        fast_info = yf.Ticker(ticker, session=quote_session).fast_info
+        # Copy into a plain dict so the result can be cached
+        quote = {key: fast_info[key] for key in ('lastPrice', 'previousClose', 'yearLow', 'yearHigh')}
+        # fast_info's own marketCap falls back to the full .info request when shares are missing (ETFs, indices, crypto)
+        shares = fast_info['shares']
+        quote['marketCap'] = shares * quote['lastPrice'] if shares and quote['lastPrice'] else None
+        return quote
+    except Exception as e:
+        st.error(f"Error fetching stock quote: {e}")
+        return None
+
+# Function to get quotes for several stocks concurrently
+@st.cache_data(ttl=60)  # Cache data for 1 minute, matching get_stock_fast_info
+def batch_info(symbols):
+    # Worker threads need the script run context so st.error() inside the fetcher still renders
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=min(16, len(symbols)), initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+        return dict(zip(symbols, executor.map(get_stock_fast_info, symbols)))
+
+# Function to format a market cap in billions
+def format_market_cap(market_cap):
+    if market_cap is None:
+        return "N/A"
+    return f"${market_cap/1_000_000_000:.2f}B"
+
+# Function to format the market cap of one ticker from the batched quotes
+def get_market_cap(quotes, ticker):
+    quote = quotes.get(ticker)
+    if not quote:
+        return "N/A"
+    return format_market_cap(quote['marketCap'])
+
+# Function to build the key metrics table, keeping values numeric and formatting them per row
+def get_metrics_table(info):
+    info_values = asdict(info)
+    keys = [key for key in METRIC_KEYS if isinstance(info_values[key], (int, float))]
+    metrics_df = pd.DataFrame(
+        {'Value': [info_values[key] for key in keys]},
+        index=pd.Index([METRIC_NAMES[key] for key in keys], name='Metric')
+    )
+    
+    # Apply each display format to all rows that share it in one pass
+    styler = metrics_df.style
+    row_formats = {METRIC_NAMES[key]: METRIC_FORMATS.get(key, DEFAULT_METRIC_FORMAT) for key in keys}
+    for metric_format in set(row_formats.values()):
+        rows = [name for name, row_format in row_formats.items() if row_format == metric_format]
+        styler = styler.format(metric_format, subset=pd.IndexSlice[rows, 'Value'])
+    return styler
+
+# Function to prefetch recent data for several stocks in a single request
+@st.cache_data(ttl=3600)  # Cache data for 1 hour
+def prefetch_popular(symbols):
+    try:
+        # Adjusted prices to match get_stock_data
+        data = yf.download(" ".join(symbols), period="5d", interval="1d", group_by='ticker', threads=True, progress=False, auto_adjust=True, session=session)
+        if data.empty:
+            return None
+        return data
+    except Exception as e:
+        st.error(f"Error prefetching popular stocks: {e}")
+        return None
+
+# Function to get the most recent close for one ticker from the prefetched data
+def get_last_close(prefetched, ticker):
+    if prefetched is None or ticker not in prefetched.columns.get_level_values(0):
+        return "N/A"
+    closes = prefetched[ticker]['Close'].dropna()
+    if closes.empty:
+        return "N/A"
+    return f"${closes.iloc[-1]:.2f}"
+
+# Function to get data for a popular stock, reusing the prefetched batch when possible
+def get_popular_stock_data(ticker):
+    prefetched = prefetch_popular(POPULAR_SYMBOLS)
+    if prefetched is not None and ticker in prefetched.columns.get_level_values(0):
+        data = prefetched[ticker].dropna(how='all')
+        if not data.empty:
+            return data
+    return get_stock_data(ticker, period="5d", interval="1d")
+
+# Function to aggregate OHLCV rows into at most max_bars candles for charting
+def downsample_ohlc(df, max_bars=CHART_MAX_CANDLES):
+    if len(df) <= max_bars:
+        return df
+    # Group consecutive rows into equal-sized buckets and keep open/high/low/close per bucket
+    bucket_size = -(-len(df) // max_bars)
+    grouped = df.groupby(np.arange(len(df)) // bucket_size)
+    data = pd.DataFrame({
+        'Open': grouped['Open'].first(),
+        'High': grouped['High'].max(),
+        'Low': grouped['Low'].min(),
+        'Close': grouped['Close'].last(),
+        'Volume': grouped['Volume'].sum()
+    })
+    data.index = df.index[::bucket_size]
+    return data
+
+# Function to fingerprint a price history for Streamlit caches without hashing every row
+def fingerprint_ohlcv(df):
+    # Histories only grow at the end, so the endpoints, length, columns and the full last row
+    # (including volume) tell apart both updated data and different tickers over the same dates
+    return (int(df.index[0].value), int(df.index[-1].value), len(df), tuple(df.columns), tuple(df.iloc[-1].tolist()))
+
+# Function to serialize the historical data for download in the selected format
+@st.cache_data(ttl=3600, hash_funcs={pd.DataFrame: fingerprint_ohlcv})
+def get_download_payload(df, file_format):
+    buffer = BytesIO()
+    if file_format == "Parquet":
+        df.to_parquet(buffer, compression='zstd')
+    elif file_format == "Feather":
+        df.reset_index().to_feather(buffer)
+    else:
+        # pyarrow writes CSV in C rather than building the text in Python
+        table = pa.Table.from_pandas(df.reset_index(), preserve_index=False)
+        # Write dates the way df.to_csv did, plain dates for midnight-aligned naive bars and pandas' text otherwise
+        if df.index.tz is None and (df.index == df.index.normalize()).all():
+            dates = pa.array(df.index.values.astype('datetime64[D]'))
+        else:
+            dates = pa.array(df.index.astype(str))
+        # Leave the body unquoted like df.to_csv, pyarrow still quotes the header row
+        pacsv.write_csv(
+            table.set_column(0, table.column_names[0], dates),
+            buffer,
+            write_options=pacsv.WriteOptions(quoting_style="none")
+        )
+    return buffer.getvalue()
+
+# Function to build the price and volume chart, reused across reruns on the same data
+@st.cache_resource(ttl=3600, max_entries=32, hash_funcs={pd.DataFrame: fingerprint_ohlcv})  # Cache figures for 1 hour
+def build_chart(df, symbol, chart_type="Candlestick"):
+    # Only the chart is downcast, the table and downloads keep the full-precision prices
+    df = downcast_ohlcv(df)
+    
+    # Create a Plotly figure with the shared layout
+    fig = go.Figure(layout=go.Layout(**CHART_LAYOUT, title=f"{symbol} Stock Price and Volume"))
+    
+    if chart_type == "Line (WebGL)":
+        # WebGL traces render on the GPU, so the full history can be drawn without aggregation
+        fig.add_trace(go.Scattergl(
+            x=df.index,
+            y=df['Close'],
+            mode='lines',
+            name='Close'
+        ))
+        
+        # Add volume as a line on a secondary y-axis
+        fig.add_trace(go.Scattergl(
+            x=df.index,
+            y=df['Volume'],
+            mode='lines',
+            name='Volume',
+            line=dict(color='rgba(0, 0, 255, 0.3)'),
+            yaxis='y2'
+        ))
+    else:
+        # Aggregate long histories so the browser only renders a bounded number of candles
+        data = downsample_ohlc(df)
+        
+        fig.add_trace(go.Candlestick(
+            x=data.index,
+            open=data['Open'],
+            high=data['High'],
+            low=data['Low'],
+            close=data['Close'],
+            name='Candlestick'
+        ))
+        
+        # Add volume as a bar chart on a secondary y-axis
+        fig.add_trace(go.Bar(
+            x=data.index,
+            y=data['Volume'],
+            name='Volume',
+            marker_color='rgba(0, 0, 255, 0.3)',
+            yaxis='y2'
+        ))
+    
+    return fig
+
+# Remember the requested parameters so the results survive reruns from widgets on the page
 if st.sidebar.button("Fetch Stock Data"):
+    st.session_state['fetch_params'] = (symbol, period, interval, start_date, end_date)
+
+# Main content area
+if 'fetch_params' in st.session_state:
+    symbol, period, interval, start_date, end_date = st.session_state['fetch_params']
     if not symbol:
         st.error("Please enter a stock symbol")
     else:
         # Display loading message
         with st.spinner(f"Fetching data for {symbol}..."):
-            # Get stock data
-            if period != "custom":
-                df = get_stock_data(symbol, period=period, interval=interval)
-            else:
-                df = get_stock_data(symbol, start=start_date, end=end_date, interval=interval)
+            # Get stock data and quote concurrently
+            # Worker threads need the script run context so st.error() inside the fetchers still renders
+            ctx = get_script_run_ctx()
+            with ThreadPoolExecutor(max_workers=2, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+                if symbol in POPULAR_STOCKS and period == "5d" and interval == "1d":
+                    # The popular stocks batch already covers this exact window
+                    df_future = executor.submit(get_popular_stock_data, symbol)
+                elif period != "custom":
+                    df_future = executor.submit(get_stock_data, symbol, period=period, interval=interval)
+                else:
+                    df_future = executor.submit(get_stock_data, symbol, start=start_date, end=end_date, interval=interval)
+                quote_future = executor.submit(get_stock_fast_info, symbol)
+                df, quote = df_future.result(), quote_future.result()
             
-            # Get stock info
-            info = get_stock_info(symbol)
-            
-            if df is None or info is None:
+            if df is None or quote is None:
                 st.error(f"Could not retrieve data for {symbol}. Please verify the stock symbol and try again.")
             else:
-                # Display company info
-                st.header(f"{info.get('shortName', symbol)} ({symbol})")
+                # Display company info. fast_info carries no company name, so use the cached info only when
+                # a detail section below already needs it, otherwise fall back to the popular stocks list
+                company_name = POPULAR_STOCKS.get(symbol)
+                if st.session_state.get('load_metrics') or st.session_state.get('load_profile'):
+                    info = get_stock_info(symbol)
+                    if info is not None and info.shortName:
+                        company_name = info.shortName
+                st.header(f"{company_name} ({symbol})" if company_name else symbol)
                 
                 # Create columns for metrics
                 col1, col2, col3, col4 = st.columns(4)
@@ -106,127 +436,68 @@ if st.sidebar.button("Fetch Stock Data"):
                 try:
                     # Display key financial metrics
                     with col1:
-                        st.metric("Current Price", f"${info.get('currentPrice', 'N/A'):.2f}")
+                        st.metric("Current Price", f"${quote['lastPrice']:.2f}")
                     
                     with col2:
-                        st.metric("Market Cap", f"${info.get('marketCap', 0)/1_000_000_000:.2f}B")
+                        st.metric("Market Cap", format_market_cap(quote['marketCap']))
                     
                     with col3:
-                        st.metric("P/E Ratio", f"{info.get('trailingPE', 'N/A'):.2f}")
+                        st.metric(
+                            "Previous Close",
+                            f"${quote['previousClose']:.2f}",
+                            help="Shown in place of the P/E ratio, which needs the full company profile. "
+                                 "Trailing and forward P/E are listed under Key Financial Metrics."
+                        )
                     
                     with col4:
-                        st.metric("52W Range", f"${info.get('fiftyTwoWeekLow', 'N/A'):.2f} - ${info.get('fiftyTwoWeekHigh', 'N/A'):.2f}")
+                        st.metric("52W Range", f"${quote['yearLow']:.2f} - ${quote['yearHigh']:.2f}")
                 except (TypeError, KeyError):
                     st.warning("Some financial metrics are not available for this stock")
                 
                 # Stock price chart
                 st.subheader("Stock Price History")
                 
-                # Create a Plotly figure
-                fig = go.Figure()
-                
-                fig.add_trace(go.Candlestick(
-                    x=df.index,
-                    open=df['Open'],
-                    high=df['High'],
-                    low=df['Low'],
-                    close=df['Close'],
-                    name='Candlestick'
-                ))
-                
-                # Add volume as a bar chart on a secondary y-axis
-                fig.add_trace(go.Bar(
-                    x=df.index,
-                    y=df['Volume'],
-                    name='Volume',
-                    marker_color='rgba(0, 0, 255, 0.3)',
-                    yaxis='y2'
-                ))
-                
-                # Update layout with secondary y-axis for volume
-                fig.update_layout(
-                    title=f"{symbol} Stock Price and Volume",
-                    xaxis_title="Date",
-                    yaxis_title="Price ($)",
-                    yaxis2=dict(
-                        title="Volume",
-                        overlaying="y",
-                        side="right",
-                        showgrid=False
-                    ),
-                    height=600,
-                    hovermode="x unified",
-                    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-                )
+                if chart_type == "Candlestick" and len(df) > CHART_MAX_CANDLES:
+                    st.caption(f"Showing aggregated candles for {len(df)} data points. Switch to the WebGL line chart for full resolution.")
                 
+                fig = build_chart(df, symbol, chart_type)
                 st.plotly_chart(fig, use_container_width=True)
                 
-                # Additional metrics table
-                st.subheader("Key Financial Metrics")
-                
-                # Create a dataframe of key metrics
-                key_metrics = {}
-                metric_keys = [
-                    'previousClose', 'open', 'dayLow', 'dayHigh', 'volume', 'averageVolume',
-                    'fiftyDayAverage', 'twoHundredDayAverage', 'marketCap', 'beta',
-                    'trailingPE', 'forwardPE', 'dividendYield', 'trailingAnnualDividendYield',
-                    'earningsQuarterlyGrowth', 'priceToSalesTrailing12Months'
-                ]
-                
-                for key in metric_keys:
-                    if key in info:
-                        # Format the value appropriately
-                        value = info[key]
-                        if 'volume' in key.lower() or key == 'marketCap':
-                            value = f"{value:,}"
-                        elif 'yield' in key.lower() and value is not None:
-                            value = f"{value:.2%}"
-                        elif isinstance(value, (int, float)):
-                            value = f"{value:.2f}"
-                        key_metrics[key] = value
-                
-                # Create a DataFrame for display
-                metrics_df = pd.DataFrame({
-                    'Metric': list(key_metrics.keys()),
-                    'Value': list(key_metrics.values())
-                })
-                
-                # Rename the metrics for better readability
-                name_mapping = {
-                    'previousClose': 'Previous Close',
-                    'open': 'Open',
-                    'dayLow': 'Day Low',
-                    'dayHigh': 'Day High',
-                    'volume': 'Volume',
-                    'averageVolume': 'Average Volume',
-                    'fiftyDayAverage': '50-Day Average',
-                    'twoHundredDayAverage': '200-Day Average',
-                    'marketCap': 'Market Cap',
-                    'beta': 'Beta',
-                    'trailingPE': 'Trailing P/E',
-                    'forwardPE': 'Forward P/E',
-                    'dividendYield': 'Dividend Yield',
-                    'trailingAnnualDividendYield': 'Trailing Annual Dividend Yield',
-                    'earningsQuarterlyGrowth': 'Earnings Quarterly Growth',
-                    'priceToSalesTrailing12Months': 'Price to Sales (TTM)'
-                }
-                
-                metrics_df['Metric'] = metrics_df['Metric'].map(lambda x: name_mapping.get(x, x))
-                
-                # Display the metrics table
-                st.table(metrics_df)
+                # Additional metrics table, loaded on request since it needs the full quote summary
+                with st.expander("Key Financial Metrics"):
+                    if st.toggle("Load key financial metrics", key='load_metrics'):
+                        info = get_stock_info(symbol)
+                        if info is None:
+                            st.warning("Key financial metrics are not available for this stock")
+                        else:
+                            # Display the metrics table
+                            st.table(get_metrics_table(info))
                 
                 # Historical data table with download option
                 st.subheader("Historical Data")
-                st.dataframe(df, use_container_width=True)
+                if len(df) > HISTORY_TABLE_ROWS:
+                    st.caption(f"Showing the most recent {HISTORY_TABLE_ROWS} of {len(df)} rows. Download the data for the full history.")
+                st.dataframe(df.iloc[-HISTORY_TABLE_ROWS:], use_container_width=True)
                 
-                # Download button for CSV
-                st.markdown(get_csv_download_link(df, f"{symbol}_data.csv"), unsafe_allow_html=True)
+                # Download button for the full history in the selected format
+                file_format = st.radio("Download format", list(DOWNLOAD_FORMATS), horizontal=True)
+                extension, mime = DOWNLOAD_FORMATS[file_format]
+                st.download_button(
+                    f"Download {file_format}",
+                    get_download_payload(df, file_format),
+                    file_name=f"{symbol}_data.{extension}",
+                    mime=mime
+                )
                 
                 # Provide some additional information about the company
-                if 'longBusinessSummary' in info:
-                    with st.expander("About the Company"):
-                        st.write(info['longBusinessSummary'])
+                with st.expander("About the Company"):
+                    # Expander bodies run even when collapsed, so the toggle is what defers the request
+                    if st.toggle("Load company profile", key='load_profile'):
+                        summary = get_business_summary(symbol)
+                        if summary:
+                            st.write(summary)
+                        else:
+                            st.write("No company profile is available for this stock.")
 
 # Provide instructions if no data has been fetched yet
 if 'df' not in locals():
@@ -234,23 +505,16 @@ if 'df' not in locals():
     
     # Display a sample of popular stocks
     st.subheader("Popular Stocks")
-    popular_stocks = {
-        "AAPL": "Apple Inc.",
-        "MSFT": "Microsoft Corporation",
-        "GOOGL": "Alphabet Inc.",
-        "AMZN": "Amazon.com, Inc.",
-        "TSLA": "Tesla, Inc.",
-        "META": "Meta Platforms, Inc.",
-        "NVDA": "NVIDIA Corporation",
-        "JPM": "JPMorgan Chase & Co.",
-        "V": "Visa Inc.",
-        "WMT": "Walmart Inc."
-    }
+    # Prefetch recent prices in one batch request and quotes in one parallel pass
+    prefetched = prefetch_popular(POPULAR_SYMBOLS)
+    quotes = batch_info(POPULAR_SYMBOLS)
     
     # Create a dataframe of popular stocks
     popular_stocks_df = pd.DataFrame({
-        "Symbol": list(popular_stocks.keys()),
-        "Company Name": list(popular_stocks.values())
+        "Symbol": list(POPULAR_STOCKS.keys()),
+        "Company Name": list(POPULAR_STOCKS.values()),
+        "Last Close": [get_last_close(prefetched, ticker) for ticker in POPULAR_STOCKS],
+        "Market Cap": [get_market_cap(quotes, ticker) for ticker in POPULAR_STOCKS]
     })
     
     st.table(popular_stocks_df)
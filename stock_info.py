@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from typing import Optional
+
+# Fields of the Yahoo Finance info payload that the app displays.
+# Kept outside app.py so the class stays importable for st.cache_data pickling across reruns.
+@dataclass(frozen=True)
+class StockInfo:
+    shortName: Optional[str] = None
+    previousClose: Optional[float] = None
+    open: Optional[float] = None
+    dayLow: Optional[float] = None
+    dayHigh: Optional[float] = None
+    volume: Optional[int] = None
+    averageVolume: Optional[int] = None
+    fiftyDayAverage: Optional[float] = None
+    twoHundredDayAverage: Optional[float] = None
+    marketCap: Optional[int] = None
+    beta: Optional[float] = None
+    trailingPE: Optional[float] = None
+    forwardPE: Optional[float] = None
+    dividendYield: Optional[float] = None
+    trailingAnnualDividendYield: Optional[float] = None
+    earningsQuarterlyGrowth: Optional[float] = None
+    priceToSalesTrailing12Months: Optional[float] = None
+    longBusinessSummary: Optional[str] = None